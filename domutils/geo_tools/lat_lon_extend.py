@@ -78,14 +78,14 @@ def lat_lon_extend(lon1_in:   Any,
 
     import numpy as np
     import cartopy.crs as ccrs
-    from .rotation_matrix  import rotation_matrix
+    from .rotation_matrix  import rotation_matrix_components
 
 
     #ensure numpy type
-    lon1 = np.array(lon1_in, copy=True)
-    lat1 = np.array(lat1_in, copy=True)
-    lon2 = np.array(lon2_in, copy=True)
-    lat2 = np.array(lat2_in, copy=True)
+    lon1 = np.atleast_1d(np.array(lon1_in, copy=True))
+    lat1 = np.atleast_1d(np.array(lat1_in, copy=True))
+    lon2 = np.atleast_1d(np.array(lon2_in, copy=True))
+    lat2 = np.atleast_1d(np.array(lat2_in, copy=True))
 
     #convert lat_lon to xyz
     if crs is None:
@@ -94,33 +94,27 @@ def lat_lon_extend(lon1_in:   Any,
     xyz_pt1 = geo_cent.transform_points(crs, lon1, lat1)
     xyz_pt2 = geo_cent.transform_points(crs, lon2, lat2)
 
-    #tmp storage vectors for xyz
-    xyz_arr = np.zeros([lon1.size,3])
+    #extend all pairs of points at once with vectorized numpy operations
 
-    #extend each pairs of points
-    for ind, (v1, v2) in enumerate(zip(xyz_pt1, xyz_pt2)):
+    #solve for angle
+    if predefined_theta is not None:
+        theta = np.broadcast_to(np.asarray(predefined_theta, dtype='float64'), lon1.shape).copy()
+    else:
+        theta = np.arccos( np.sum(xyz_pt1*xyz_pt2, axis=1)
+                           / (np.linalg.norm(xyz_pt1, axis=1)*np.linalg.norm(xyz_pt2, axis=1)) )
+    if half_dist :
+        theta /= 2.
 
-        #solve for angle
-        if predefined_theta is not None:
-            theta = predefined_theta
-        else:
-            theta = np.arccos( np.sum(v1*v2) / (np.linalg.norm(v1)*np.linalg.norm(v2)) )
-        if half_dist :
-            theta /= 2.
+    #get normal vectors
+    v3 = np.cross(xyz_pt1, xyz_pt2)
+    v3 /= np.linalg.norm(v3, axis=1)[...,np.newaxis]     #normalize
 
-        #get normal vector
-        v3 = np.cross(v1,v2)
-        v3 /= np.linalg.norm(v3)     #normalize 
+    #components of the rotation matrices that map pt1 to pt2
+    a, b, c, d, e, f, g, h, i = rotation_matrix_components(v3, theta)
 
-        #;define rotation matrix that maps pt1 to pt2
-        mm = rotation_matrix(v3, theta)
-
-        #xyz position of result
-        v4 = np.matmul(mm,v2)
-
-        #save results for later conversion to latlon
-        xyz_arr[ind,:] = v4
-    #endfor
+    #xyz position of results
+    oi, oj, ok = xyz_pt2[:,0], xyz_pt2[:,1], xyz_pt2[:,2]
+    xyz_arr = np.stack([a*oi+b*oj+c*ok, d*oi+e*oj+f*ok, g*oi+h*oj+i*ok], axis=-1)
 
     #output in lat/lon
     lonlat = crs.transform_points(geo_cent, xyz_arr[:,0], xyz_arr[:,1], xyz_arr[:,2])
@@ -679,13 +679,14 @@ class ProjInds():
                 (good_pts,) = np.asarray( np.abs(self.proj_ind - self.missing) >= 1e-3 ).nonzero()
                 if good_pts.size > 0 :
                     in_inds = self.proj_ind[good_pts]
-                    ii = np.arange(self.proj_ind.size)
-                    out_inds = ii[good_pts]
-                    for in_pt, out_pt in zip(in_inds, out_inds):
-                        data_accumulator[in_pt]    += weights_flat[out_pt]*data_flat[out_pt]
-                        weights_accumulator[in_pt] += weights_flat[out_pt]*weights_flat[out_pt]
-                        denom[in_pt]       += weights_flat[out_pt]
-                        n_hits[in_pt]      += 1
+                    good_weights = weights_flat[good_pts]
+                    good_data    = data_flat[good_pts]
+                    #bincount performs the scatter-add accumulation in one vectorized pass
+                    n_bins = data_accumulator.size
+                    data_accumulator    += np.bincount(in_inds, weights=good_weights*good_data,    minlength=n_bins)
+                    weights_accumulator += np.bincount(in_inds, weights=good_weights*good_weights, minlength=n_bins)
+                    denom               += np.bincount(in_inds, weights=good_weights,              minlength=n_bins)
+                    n_hits              += np.bincount(in_inds, minlength=n_bins).astype(n_hits.dtype)
 
             #the averaging part
             (hits,) = np.logical_and(denom > 0., n_hits >= self.min_hits).nonzero()
@@ -2,6 +2,10 @@
 #python test_geo_tools.py TestStringMethods.test_no_extent_in_cartopy_projection
 
 import unittest
+import matplotlib
+#figures are rendered off screen; selecting agg before the first pyplot
+#import avoids initializing an interactive gui backend
+matplotlib.use('Agg')
 
 class TestStringMethods(unittest.TestCase):
 
@@ -250,6 +254,65 @@ class TestStringMethods(unittest.TestCase):
         ##test that sum of projected_data equals some pre-validated value
         self.assertListEqual(projected_data.tolist(), expected)
 
+    def test_border_detection_modes(self):
+        '''
+        nearest neighbor interpolation for the four combinations of extend_x/extend_y
+        all outputs are checked at once against a stacked reference
+        '''
+
+        import numpy as np
+        import domutils.geo_tools as geo_tools
+
+
+        #source data on a very simple grid
+        src_lon =      [ [-90.1 , -90.1  ],
+                         [-89.1 , -89.1  ] ]
+        src_lat =      [ [ 44.1  , 45.1  ],
+                         [ 44.1  , 45.1  ] ]
+        src_data =     [ [  3    ,  1    ],
+                         [  4    ,  2    ] ]
+
+        #destination grid is larger than the source grid and slightly offset
+        dest_lon =     [ [-91. , -91  , -91 , -91  ],
+                         [-90. , -90  , -90 , -90  ],
+                         [-89. , -89  , -89 , -89  ],
+                         [-88. , -88  , -88 , -88  ] ]
+        dest_lat =     [ [ 43  ,  44  ,  45 ,  46 ],
+                         [ 43  ,  44  ,  45 ,  46 ],
+                         [ 43  ,  44  ,  45 ,  46 ],
+                         [ 43  ,  44  ,  45 ,  46 ] ]
+
+        #interpolate with border detection in both, one or no directions
+        projected = np.stack([geo_tools.ProjInds(src_lon=src_lon,   src_lat=src_lat,
+                                                 dest_lon=dest_lon, dest_lat=dest_lat,
+                                                 missing=-99.,
+                                                 extend_x=extend_x, extend_y=extend_y).project_data(src_data)
+                              for (extend_x, extend_y) in [(True,  True ),
+                                                           (False, True ),
+                                                           (True,  False),
+                                                           (False, False)]])
+
+        #reference data when this works
+        expected = np.stack([ [ [-99., -99., -99., -99.],
+                                [-99.,   3.,   1., -99.],
+                                [-99.,   4.,   2., -99.],
+                                [-99., -99., -99., -99.] ],
+                              [ [-99.,   3.,   1., -99.],
+                                [-99.,   3.,   1., -99.],
+                                [-99.,   4.,   2., -99.],
+                                [-99.,   4.,   2., -99.] ],
+                              [ [-99., -99., -99., -99.],
+                                [  3.,   3.,   1.,   1.],
+                                [  4.,   4.,   2.,   2.],
+                                [-99., -99., -99., -99.] ],
+                              [ [  3.,   3.,   1.,   1.],
+                                [  3.,   3.,   1.,   1.],
+                                [  4.,   4.,   2.,   2.],
+                                [  4.,   4.,   2.,   2.] ] ])
+
+        #one vectorized comparison for the four border-detection modes
+        np.testing.assert_allclose(projected, expected)
+
     def test_1d_inputs(self):
         '''
         make sure ProjInds accepts 1D inputs for lat/lon and data
@@ -24,12 +24,12 @@ class cb_noshow(mpc.ColorbarBase):
         # returns the X and Y mesh, *but* this was/is in normalized
         # units:
         X, Y = self._mesh()
-        C = self._values[:, np.newaxis]
         self._config_axes(X, Y)
         #
         #Turning off palette from colorbar
         #
         #if self.filled:
+        #    C = self._values[:, np.newaxis]
         #    self._add_solids(X, Y, C)
 
     def _config_axes(self, X, Y):
@@ -40,6 +40,18 @@ class cb_noshow(mpc.ColorbarBase):
         ax.set_frame_on(False)
         ax.set_navigate(False)
         xy = self._outline(X, Y)
+
+        #skip artist reconstruction when outline geometry is unchanged
+        #(repeated draw_all calls on animated/interactive figures)
+        #the outline must still live on the axes: ax.cla() removes the artist
+        #without clearing the cached geometry, in which case we rebuild
+        xy_bytes = np.asarray(xy).tobytes()
+        if (getattr(self, '_outline_xy_bytes', None) == xy_bytes
+                and self.outline is not None and self.outline.axes is ax):
+            self.update_ticks()
+            return
+        self._outline_xy_bytes = xy_bytes
+
         ax.update_datalim(xy)
         ax.set_xlim(*ax.dataLim.intervalx)
         ax.set_ylim(*ax.dataLim.intervaly)
@@ -0,0 +1,11 @@
+import numpy as np
+
+#from strings to numpy comparison ufuncs
+#built once at import time; mapping objects look operators up at map() time
+#since legs.PalObj may adjust operator strings after instantiation
+#ufuncs rather than the operator module equivalents so that callers
+#may pass an out= buffer
+oper = { ">" : np.greater,
+         ">=": np.greater_equal,
+         "<" : np.less,
+         "<=": np.less_equal}
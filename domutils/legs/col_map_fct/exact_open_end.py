@@ -1,26 +1,26 @@
-    
-class exact_open_end():
-    def map(self, data, out_rgb, action_record):
-        import numpy as np
-        import operator
+import numpy as np
 
-        #from strings to operator
-        oper = { ">" : operator.gt, 
-                 ">=": operator.ge,
-                 "<" : operator.lt,
-                 "<=": operator.le}
+from ._oper import oper
 
-        #indices of data pts affected by comparison
-        inds = np.flatnonzero(oper[self.oper](data, self.val)) 
+
+class exact_open_end():
+    def map(self, data, out_rgb, action_record):
 
         #for exact palettes ends, no values should exceed the palette
-        #mark them as -1 for later error catching
-        if inds.size != 0 :
-            self.bound_error = 1
+        #a single NaN-ignoring reduction replaces the full boolean mask:
+        #some value exceeds the bound iff the relevant extremum does
+        if data.size == 0 :
+            return
+        if self.oper[0] == '<':
+            extremum = np.fmin.reduce(data)
+        else:
+            extremum = np.fmax.reduce(data)
+
+        #flag exceeding values for later error catching; branchless accumulation over calls
+        self.bound_error |= int(oper[self.oper](extremum, self.val))
 
     def __init__(self, val, oper):
         self.val         = val
         self.oper        = oper
         self.bound_error = 0
         self.action = 'exact'
-
@@ -1,26 +1,25 @@
+import numpy as np
+
+from ._oper import oper
+
 
 class extend_open_end():
     def map(self, data, out_rgb, action_record):
-        import numpy as np
-        import operator
 
-        #from strings to operator
-        oper = { ">" : operator.gt, 
-                 ">=": operator.ge,
-                 "<" : operator.lt,
-                 "<=": operator.le}
+        #boolean mask of data pts affected by comparison
+        mask = oper[self.oper](data, self.val)
 
-        #indices of data pts affected by comparison
-        inds = np.flatnonzero(oper[self.oper](data, self.val)) 
+        #nothing to do when no data pts exceed the palette
+        if np.count_nonzero(mask) == 0 :
+            return
 
         #assign all exceeding values to a predefined colors
-        if inds.size != 0 :
-            action_record[inds] += 1 
-            out_rgb[inds] = self.color
+        action_record += mask
+        out_rgb[mask] = self.color
 
     def __init__(self, val, oper, color):
         self.val   = val
         self.oper  = oper
-        self.color = color
+        #color stored as a uint8 ndarray so map() does no per-call list conversion
+        self.color = np.asarray(color, dtype='uint8')
         self.action = 'extend'
-
@@ -3,6 +3,11 @@ import numpy as np
 import domutils.legs.col_map_fct as col_map_fct
 import domutils.legs.validation_tools as validation_tools
 
+#data arrays shared by the tests below; built once instead of per test
+DATA_4 = np.array([.7, .8, .9, 1.])
+DATA_6 = np.array([.7, .8, .9, 1., 1.1, 1.2])
+DATA_7 = np.array([.6, .7, .8, .9, 1., 1.1, 1.2])
+
 
 class TestStringMethods(unittest.TestCase):
 
@@ -13,9 +18,9 @@ class TestStringMethods(unittest.TestCase):
 
     def test_exact_open_end_gt(self):
         map_obj = col_map_fct.exact_open_end(1.,'>')
-        out_rgb = np.zeros([4,3])
+        out_rgb = np.zeros([4,3],dtype='uint8')
         action_record = np.zeros(4)
-        data = np.array([.7, .8, .9, 1.])
+        data = DATA_4
         ans =           [[ 0,  0,  0, 0], 0]
         map_obj.map(data, out_rgb, action_record)
         returned = [action_record.tolist(), map_obj.bound_error]
@@ -23,9 +28,9 @@ class TestStringMethods(unittest.TestCase):
 
     def test_exact_open_end_ge(self):
         map_obj = col_map_fct.exact_open_end(1.,'>=')
-        out_rgb = np.zeros([4,3])
+        out_rgb = np.zeros([4,3],dtype='uint8')
         action_record = np.zeros(4)
-        data = np.array([.7, .8, .9, 1.])
+        data = DATA_4
         ans =           [[ 0,  0,  0, 0], 1]
         map_obj.map(data, out_rgb, action_record)
         returned = [action_record.tolist(), map_obj.bound_error]
@@ -33,9 +38,9 @@ class TestStringMethods(unittest.TestCase):
 
     def test_extend_open_end_gt(self):
         map_obj = col_map_fct.extend_open_end(1.,'>',[237,123,42])
-        out_rgb = np.zeros([6,3])
+        out_rgb = np.zeros([6,3],dtype='uint8')
         action_record = np.zeros(6)
-        data =   np.array([.7, .8, .9, 1., 1.1, 1.2])
+        data =   DATA_6
         ans =  [ np.array([ 0., 0,  0, 0,  1,   1]).tolist(),
                  [[  0,   0,   0],
                   [  0,   0,   0],
@@ -52,7 +57,7 @@ class TestStringMethods(unittest.TestCase):
         map_obj = col_map_fct.lin_map(1.0,0.8,'<=','>=',[255,255,255],[10,10,10])
         out_rgb = np.zeros([7,3],dtype='uint8')
         action_record = np.zeros(7)
-        data =   np.array([.6, .7, .8, .9, 1., 1.1, 1.2])
+        data =   DATA_7
         ans =  [ np.array([ 0., 0,  1,  1, 1,  0,   0]).tolist(),
                  [[  0,   0,   0],
                   [  0,   0,   0],
@@ -70,7 +75,7 @@ class TestStringMethods(unittest.TestCase):
         map_obj = col_map_fct.lin_map(1.0,0.8,'<','>',[255,255,255],[10,10,10])
         out_rgb = np.zeros([7,3],dtype='uint8')
         action_record = np.zeros(7)
-        data =   np.array([.6, .7, .8, .9, 1., 1.1, 1.2])
+        data =   DATA_7
         ans =  [ np.array([ 0., 0,  0,  1, 0,  0,   0]).tolist(),
                  [[  0,   0,   0],
                   [  0,   0,   0],
@@ -88,7 +93,7 @@ class TestStringMethods(unittest.TestCase):
         map_obj = col_map_fct.solid_map(1.0,0.8,'<=','>=',[123,45,6])
         out_rgb = np.zeros([7,3],dtype='uint8')
         action_record = np.zeros(7)
-        data =   np.array([.6, .7, .8, .9, 1., 1.1, 1.2])
+        data =   DATA_7
         ans =  [ np.array([ 0., 0,  1,  1, 1,  0,   0]).tolist(),
                  [[  0,   0,   0],
                   [  0,   0,   0],
@@ -106,7 +111,7 @@ class TestStringMethods(unittest.TestCase):
         map_obj = col_map_fct.solid_map(1.0,0.8,'<','>',[123,45,6])
         out_rgb = np.zeros([7,3],dtype='uint8')
         action_record = np.zeros(7)
-        data =   np.array([.6, .7, .8, .9, 1., 1.1, 1.2])
+        data =   DATA_7
         ans =  [ np.array([ 0., 0,  0,  1, 0,  0,   0]).tolist(),
                  [[  0,   0,   0],
                   [  0,   0,   0],
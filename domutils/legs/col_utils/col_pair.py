@@ -1,19 +1,39 @@
+from functools import lru_cache
+
+from .col_rgb import _one_col_rgb
+
+supported_cols = ['blue',
+                  'purple',
+                  'green',
+                  'red',
+                  'orange',
+                  'pink',
+                  'brown',
+                  'yellow',
+                  'b_w']
+
+
+@lru_cache(maxsize=512)
+def _one_col_pair(this_col):
+    #resolve one color name to its light/dark rgb pair; None when the name is unknown
+    if this_col == 'b_w' :
+        #b_w is a special case
+        return (_one_col_rgb('white'), _one_col_rgb('black'))
+    elif any(this_col == this_str for this_str in supported_cols):
+        #we got a supported color
+        return (_one_col_rgb('light_'+this_col), _one_col_rgb('dark_'+this_col))
+    elif this_col[0:5] == 'grey_' or this_col[0:5] == 'gray_':
+        #we got the grey color
+        this_rgb = _one_col_rgb(this_col)
+        return (this_rgb, this_rgb)
+    return None
+
+
 def col_pair(col_txt_in, var_name=None, instructions=None):
     #returns a dark/light pair for a given color for the purpose of building a semi-continuous leg
-    from .. import col_utils 
     from .. import validation_tools as validate
     from os import linesep as newline
 
-    supported_cols = ['blue',
-                      'purple',
-                      'green',
-                      'red',
-                      'orange',
-                      'pink',
-                      'brown',
-                      'yellow',
-                      'b_w']
-
     #make sure input is of appropriate type
     if isinstance(col_txt_in,list):
         col_txt_list  = col_txt_in
@@ -26,16 +46,9 @@ def col_pair(col_txt_in, var_name=None, instructions=None):
     out_rgb = []
     for this_col in col_txt_list:
 
-        if this_col == 'b_w' :
-            #b_w is a special case
-            out_rgb.append([col_utils.col_rgb('white'), col_utils.col_rgb('black')])
-        elif any(this_col == this_str for this_str in supported_cols):
-            #we got a supported color
-            out_rgb.append([col_utils.col_rgb('light_'+this_col), col_utils.col_rgb('dark_'+this_col)])
-        elif this_col[0:5] == 'grey_' or this_col[0:5] == 'gray_':
-            #we got the grey color
-            this_rgb = col_utils.col_rgb(this_col)
-            out_rgb.append([this_rgb, this_rgb])
+        this_pair = _one_col_pair(this_col)
+        if this_pair is not None:
+            out_rgb.append([list(this_pair[0]), list(this_pair[1])])
         else:
             #color not supported
             err_mess      =  newline+' '                               + newline
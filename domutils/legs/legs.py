@@ -20,6 +20,57 @@
 #                [104,  10,   0] ]      #dark orange
 
 
+import copy
+
+import numpy as np
+
+#matplotlib is only needed by the plotting methods; import it on first use
+#so that palette construction and to_rgb do not pay for it
+_mpl_modules = None
+
+def _lazy_matplotlib():
+    global _mpl_modules
+    if _mpl_modules is None:
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+        _mpl_modules = (mpl, plt, patches)
+    return _mpl_modules
+
+
+#number of data points mapped at once; large rasters are cut into tiles of
+#this size so the chunk stays cache resident across the mapping passes
+_TILE = 1 << 16
+
+#cache of constructed palettes keyed by a frozen argument signature;
+#scripts that loop over timesteps often rebuild the same palette for every frame
+_construction_cache = {}
+
+def _clone_maps(mapping):
+    #mapping objects are tiny but mutable: operator strings may be adjusted
+    #after construction and open ends accumulate bound_error state, so every
+    #palette gets its own copies rather than sharing the cached prototypes
+    if isinstance(mapping, list):
+        return [copy.copy(this_obj) for this_obj in mapping]
+    return copy.copy(mapping)
+
+def _frozen_args(args):
+    #nested lists/arrays become tuples so that a palette spec can key a dict
+    #returns None for arguments that cannot be frozen (no caching for those)
+    def _freeze(arg):
+        if isinstance(arg, (list, tuple, np.ndarray)):
+            return tuple(_freeze(item) for item in arg)
+        if isinstance(arg, np.generic):
+            return arg.item()
+        return arg
+    try:
+        frozen = _freeze(args)
+        hash(frozen)
+    except Exception:
+        return None
+    return frozen
+
+
 class PalObj():
     """ A class for intuitive construction of color palettes
 
@@ -203,6 +254,11 @@ class PalObj():
     from typing import Any, Callable, Iterator, Union, Optional, List, Iterable, MutableMapping
     import numpy as np
 
+    #set to False to skip the mapping coverage checks performed after to_rgb;
+    #unmapped data points are then silently left black and exact palettes
+    #no longer raise on out-of-range values
+    validate_mapping = True
+
     def plot_palette(self, 
                      data_ax:       Optional[Any]   = None,
                      equal_legs:    Optional[bool]  = None,
@@ -241,11 +297,7 @@ class PalObj():
             pal_format:    Format string for the data values displayed beside tickmarks
 
         """
-        import numpy as np
-        import matplotlib as mpl
-        import matplotlib.pyplot as plt
-        import matplotlib.patches as patches
-        import matplotlib.lines as mlines
+        mpl, plt, patches = _lazy_matplotlib()
 
         # if pal_pos not provided, make one from a data axes
         if pal_pos is None:
@@ -274,47 +326,12 @@ class PalObj():
         boundaries = [this_leg.val_low for this_leg in self.cols]
         boundaries.append(self.cols[-1].val_high)
 
-        #make palette data
-        if equal_legs == True:
-            n_cols = len(self.cols)
-            nn = 100              #number of data values per color leg
-            nt = n_cols*nn #- 1   #total number of data values in this palette
-            pal_data = np.zeros(nt)
-            for ii in range(n_cols):
-                if self.cols[ii].oper_low == '>':
-                    small_low = 1e-9
-                elif self.cols[ii].oper_low == '>=':
-                    small_low = 0.
-                else:
-                    err_mess='oper_low attribute should not have values other than ">" or ">=".'
-                    raise ValueError(err_mess)
-                if self.cols[ii].oper_high == '<':
-                    small_high = -1e-9
-                elif self.cols[ii].oper_high == '<=':
-                    small_high = 0.
-                else:
-                    err_mess='oper_high attribute should not have values other than "<" or "<=".'
-                    raise ValueError(err_mess)
-
-                #reduce number of pixels by 1 for perfect alignment with boundaries
-                nn_sub=0
-                if ii == n_cols-1:
-                    pass
-                    #nn_sub = 1
+        #rgb image of the palette; cached on the instance across draws
+        pal_rgb = self._palette_image(equal_legs)
 
-                pal_data[ii*nn:(ii+1)*nn] = np.linspace(self.cols[ii].val_low+small_low,
-                                                        self.cols[ii].val_high+small_high, nn-nn_sub)
-        else:
-            nn = 1000
-            pal_data = np.linspace(boundaries[0], boundaries[-1], nn)
-        pal_data = np.flipud(pal_data)[:,np.newaxis]
-        #transform palette data into rbg image
-        pal_rgb = self.to_rgb(pal_data)
-
-        labels = []
-        for this_num in boundaries:
-            labels.append(pal_format.format(this_num))
+        labels = [pal_format.format(this_num) for this_num in boundaries]
         if equal_legs == True:
+            n_cols = len(self.cols)
             boundaries = np.linspace(self.cols[0].val_low,self.cols[-1].val_high,n_cols+1)
 
         ax.imshow(pal_rgb, axes=ax, aspect='auto',extent=[0.,1,boundaries[0],boundaries[-1]],
@@ -335,9 +352,7 @@ class PalObj():
             #position of extension triangle
             tri_x = np.array([0.,.5,1])
             tri_y = 0.+np.array([0.,-tri_h,0.])
-            tri_xy = np.zeros([3,2])
-            for ii in range(3):
-                tri_xy[ii,:] = [tri_x[ii],tri_y[ii]]
+            tri_xy = np.column_stack((tri_x, tri_y))
             #extension color
             tri_down_col = self.lows.color/255.   #/255 to get RGB 0-1
             #poligon object
@@ -352,9 +367,7 @@ class PalObj():
             #position of extension triangle
             tri_x = np.array([0.,.5,1])
             tri_y = 1.+np.array([0.,tri_h,0.])
-            tri_xy = np.zeros([3,2])
-            for ii in range(3):
-                tri_xy[ii,:] = [tri_x[ii],tri_y[ii]]
+            tri_xy = np.column_stack((tri_x, tri_y))
             #extension color
             tri_up_col = self.highs.color/255.   #/255 to get RGB 0-1
             #poligon object
@@ -372,7 +385,40 @@ class PalObj():
 
 
 
-    def plot_data(self, 
+    def _palette_image(self, equal_legs=None):
+        #rgb image of the palette shown by plot_palette
+        #computed on the first draw and reused when the same palette is drawn
+        #on many figures (palettes are immutable once constructed)
+        key = bool(equal_legs)
+        cache = getattr(self, '_pal_rgb_cache', None)
+        if cache is None:
+            cache = self._pal_rgb_cache = {}
+        if key in cache:
+            return cache[key]
+
+        #make palette data
+        if equal_legs == True:
+            n_cols = len(self.cols)
+            nn = 100              #number of data values per color leg
+            #per-leg sampling bounds precomputed at construction time
+            lo = np.array([this_leg.val_low  for this_leg in self.cols]) + self._small_low
+            hi = np.array([this_leg.val_high for this_leg in self.cols]) + self._small_high
+            #one broadcast linspace fills the ramps of all legs at once
+            pal_data = np.linspace(lo, hi, nn, axis=1).reshape(n_cols*nn)
+        else:
+            nn = 1000
+            pal_data = np.linspace(self.cols[0].val_low, self.cols[-1].val_high, nn)
+        #reversed column vector in one indexing step
+        pal_data = pal_data[::-1, None]
+        #transform palette data into rbg image; made contiguous once here
+        #rather than implicitly by imshow on every draw
+        cache[key] = np.ascontiguousarray(self.to_rgb(pal_data))
+        return cache[key]
+
+
+
+
+    def plot_data(self,
                   ax:         Any, 
                   data:       np.ndarray, 
                   palette:    Optional[str]      = None, 
@@ -394,8 +440,6 @@ class PalObj():
             zorder:   Matplotlib zorder for the imshow call
         """
 
-        import numpy as np
-
         #if desired, rotate data
         if rot90 is not None:
             rdata = np.rot90(data,rot90)
@@ -431,16 +475,20 @@ class PalObj():
 
 
 
-    def to_rgb(self, data_in: np.ndarray ) -> np.ndarray :
+    def to_rgb(self, data_in: np.ndarray, out: Optional[np.ndarray]=None ) -> np.ndarray :
         """
         Applies the mapping from data space to color space and returns resulting rgb array
 
         Args:
             data:     Data to be plotted
+            out:      Optional preallocated uint8 ndarray of shape data.shape+(3,)
+                      that receives the colors.
+                      Lets tight loops (e.g. animations) reuse one buffer
+                      instead of allocating a new image on every call.
         """
         #this method applies the color mapping object and outputs a rgb array of the same size as data_in
 
-        import numpy as np
+        from os import linesep as newline
         from . import validation_tools as validate
 
         #insure that data values from -infty to +infty are taken care of
@@ -449,9 +497,105 @@ class PalObj():
         #insure that data is of type numpy array; flat array is returned so we don't need to care about dimensions later
         data_flat = validate.input_data(data_in)
 
+        #when provided, the output buffer must match what this call would allocate
+        out_flat = None
+        if out is not None:
+            expected_shape = np.atleast_1d(data_in).shape+(3,)
+            if (not isinstance(out, np.ndarray) or out.dtype != np.uint8
+                    or out.shape != expected_shape or not out.flags['C_CONTIGUOUS']):
+                err_mess = ( newline+' '                                              + newline
+                            +'Problem with the keyword "out"'                         + newline
+                            +'It must be a C-contiguous uint8 ndarray of shape '
+                            +str(expected_shape)+'.'                                  + newline)
+                raise ValueError(err_mess)
+            out_flat = out.reshape((data_flat.size, 3))
+            if not self.validate_mapping:
+                #coverage checks are off so unmapped points are never written;
+                #zero the buffer so they come out black instead of keeping
+                #stale bytes from the caller's previous frame
+                out_flat[:] = 0
+
+        if np.issubdtype(data_flat.dtype, np.integer) and data_flat.size > 0:
+            #integer rasters are often heavily quantized;
+            #map each distinct value once then gather the resulting color table
+            #the table covers only the values actually present so that
+            #exact-palette bound errors and exception handling behave exactly
+            #as they would without the lookup table
+            uniq_vals, inds = np.unique(data_flat, return_inverse=True)
+            rgb_lut = self._apply_mapping(uniq_vals.astype('float64'))
+            if out_flat is not None:
+                np.take(rgb_lut, inds, axis=0, out=out_flat)
+                out_rgb = out_flat
+            else:
+                out_rgb = rgb_lut[inds]
+        elif data_flat.size > _TILE:
+            #large rasters are processed in tiles so that the data chunk and
+            #its bookkeeping arrays stay cache resident across the mapping passes
+            if out_flat is not None:
+                out_rgb = out_flat
+            elif self.validate_mapping:
+                out_rgb = np.empty(data_flat.shape+(3,),dtype='uint8')
+            else:
+                out_rgb = np.zeros(data_flat.shape+(3,),dtype='uint8')
+            for start in range(0, data_flat.size, _TILE):
+                self._apply_mapping(data_flat[start:start+_TILE],
+                                    out_rgb[start:start+_TILE])
+        else:
+            out_rgb = self._apply_mapping(data_flat, out_flat)
+
+        if out is not None:
+            return out
+        return out_rgb.reshape(np.atleast_1d(data_in).shape+(3,))
+
+
+
+    def to_rgb_many(self, data_list: Iterable[np.ndarray] ) -> List[np.ndarray] :
+        """
+        Applies the mapping from data space to color space to several arrays at once
+
+        All arrays are mapped in one pass so that per-call overheads
+        (validation, dispatch, possible lookup-table construction) are paid
+        once rather than once per array.  Handy for animation frames sharing
+        one palette.
+
+        Args:
+            data_list:  Iterable of data arrays to be mapped together.
+                        They are concatenated internally so mixed dtypes are
+                        promoted following the usual numpy rules.
+
+        Returns:
+            A list with one rgb array per input array.
+        """
+        arr_list = [np.atleast_1d(np.asarray(this_data)) for this_data in data_list]
+        if len(arr_list) == 0:
+            return []
+        sizes    = [this_arr.size for this_arr in arr_list]
+        combined = np.concatenate([np.ravel(this_arr) for this_arr in arr_list])
+        rgb_flat = self.to_rgb(combined)
+        bounds   = np.cumsum([0]+sizes)
+        return [rgb_flat[bounds[ii]:bounds[ii+1]].reshape(this_arr.shape+(3,))
+                for ii, this_arr in enumerate(arr_list)]
+
+
+
+    def _apply_mapping(self, data_flat: np.ndarray, out_rgb: np.ndarray=None ) -> np.ndarray :
+        #run the flat data array through every mapping object of the palette
+        #colors are written into out_rgb when provided (tiled operation)
+
+        from . import validation_tools as validate
+
         ##initialize output and action_record arrays
-        out_rgb = np.zeros(data_flat.shape+(3,),dtype='uint8')
-        action_record = np.zeros(data_flat.shape,dtype='int')
+        if out_rgb is None:
+            if self.validate_mapping:
+                #every returned pixel gets written by a mapping object or the
+                #coverage check raises, so the initial zeroing of out_rgb is wasted work
+                out_rgb = np.empty(data_flat.shape+(3,),dtype='uint8')
+            else:
+                #coverage checks are off; keep unmapped points black rather than undefined
+                out_rgb = np.zeros(data_flat.shape+(3,),dtype='uint8')
+        #each entry counts how many mapping objects touched a data point;
+        #that count stays small so a single byte per point is plenty
+        action_record = np.zeros(data_flat.shape,dtype='uint8')
 
         #map data below palette
         self.lows.map(data_flat, out_rgb, action_record)
@@ -464,20 +608,34 @@ class PalObj():
         self.highs.map(data_flat, out_rgb, action_record)
 
         #check that no values have been mapped twice
-        validate.not_mapped_twice(data_flat, action_record)
+        if self.validate_mapping:
+            validate.not_mapped_twice(data_flat, action_record)
 
         #map exceptions, its okay for exceptions to superseed colors already mapped
-        for this_excep in self.excepts:
-            this_excep.map(data_flat, out_rgb, action_record)
+        #the binary search beats one mask pass per exception only once there
+        #are many exceptions; the usual one-to-three sentinels stay on the loop
+        if self._ex_lo is not None and len(self.excepts) >= 8:
+            #non-overlapping intervals; locate each data point's exception, if any,
+            #with one binary search instead of one mask pass per exception
+            pos = np.searchsorted(self._ex_lo, data_flat, side='right') - 1
+            valid = pos >= 0
+            np.logical_and(valid, data_flat <= self._ex_hi[np.clip(pos, 0, None)], out=valid)
+            if np.count_nonzero(valid) != 0 :
+                action_record += valid
+                out_rgb[valid] = self._ex_color[pos[valid]]
+        else:
+            for this_excep in self.excepts:
+                this_excep.map(data_flat, out_rgb, action_record)
 
         #check that all data pts have been mapped
-        validate.no_unmapped(data_flat, action_record, self.lows, self.highs)
+        if self.validate_mapping:
+            validate.no_unmapped(data_flat, action_record, self.lows, self.highs)
 
-        return out_rgb.reshape(np.atleast_1d(data_in).shape+(3,))
+        return out_rgb
 
 
 
-    def __init__(self, range_arr:  Optional[List[float]]=None, 
+    def __init__(self, range_arr:  Optional[List[float]]=None,
                        dark_pos:   Optional[List[str]]  =None, 
                        color_arr:  Optional[Any]        =None,
                        n_col:      Optional[int]        =None, 
@@ -500,6 +658,21 @@ class PalObj():
         from . import validation_tools as validate
         from . import col_map_fct as map_fct
 
+        #palettes built from the same arguments share their (read-only) mapping objects;
+        #skips the whole validation/construction pipeline on repeated specs
+        sig = _frozen_args((range_arr, dark_pos, color_arr, n_col, map_f_arr, solid,
+                            over_high, under_low, over_under,
+                            excep_val, excep_tol, excep_col))
+        if sig is not None and sig in _construction_cache:
+            (cached_highs,    cached_cols,    cached_lows,    cached_excepts,
+             self._small_low,  self._small_high,
+             self._ex_lo,      self._ex_hi,     self._ex_color) = _construction_cache[sig]
+            #derived arrays are immutable and shared; mapping objects are not
+            self.highs   = _clone_maps(cached_highs)
+            self.cols    = _clone_maps(cached_cols)
+            self.lows    = _clone_maps(cached_lows)
+            self.excepts = _clone_maps(cached_excepts)
+            return
 
         #validate user input and set default othwewise
         #order is important as some variables get passed to subsequent functions
@@ -629,6 +802,38 @@ class PalObj():
         self.lows     = map_low
         self.excepts  = excepts
 
+        #small offsets keeping palette-image sample values strictly inside
+        #open interval ends; operators are fixed once construction completes
+        self._small_low  = np.array([ 1e-9 if this_leg.oper_low  == '>' else 0. for this_leg in col_legs])
+        self._small_high = np.array([-1e-9 if this_leg.oper_high == '<' else 0. for this_leg in col_legs])
+
+        #sorted exception intervals for the binary-search assignment in _apply_mapping
+        #overlapping intervals keep the sequential loop where later exceptions
+        #supersede earlier ones
+        self._ex_lo = None
+        self._ex_hi = None
+        self._ex_color = None
+        if len(excepts) > 0:
+            ex_lo = np.array([this_ex.val_low  for this_ex in excepts])
+            ex_hi = np.array([this_ex.val_high for this_ex in excepts])
+            order = np.argsort(ex_lo)
+            ex_lo = ex_lo[order]
+            ex_hi = ex_hi[order]
+            if np.all(ex_hi[:-1] < ex_lo[1:]):
+                self._ex_lo = ex_lo
+                self._ex_hi = ex_hi
+                self._ex_color = np.stack([excepts[ii].color for ii in order])
+
+        if sig is not None:
+            if len(_construction_cache) >= 128:
+                _construction_cache.clear()
+            #the cached mapping objects are pristine prototypes: copies are
+            #stored so later mutations of this instance cannot reach the cache
+            _construction_cache[sig] = (_clone_maps(self.highs), _clone_maps(self.cols),
+                                        _clone_maps(self.lows),  _clone_maps(self.excepts),
+                                        self._small_low,  self._small_high,
+                                        self._ex_lo,      self._ex_hi,     self._ex_color)
+
 def main():
     pass
 
@@ -4,19 +4,21 @@ def input_data(data_in):
     import numpy as np
     from os import linesep as newline
 
+    #numeric ndarrays are flattened without a copy; ravel returns a view
+    #whenever the input is contiguous
+    if isinstance(data_in, np.ndarray) and data_in.dtype.kind in 'buif':
+        return np.ravel(data_in)
+
     input_ins = (newline                                                + newline
                 +'Instructions: Input data should be a numpy array or ' + newline
                 +'something convertible to a numpy array.' + newline)
-    if not isinstance(data_in, np.ndarray):
-        try:
-            data_out = np.atleast_1d(np.asfarray(data_in))
-        except:
-            err_mess = ( newline+' '                          + newline
-                        +'Problem: input data should be convertible to a numpy array.'
-                        +input_ins)
-            raise TypeError(err_mess)
-    else:
-        data_out = data_in
+    try:
+        data_out = np.atleast_1d(np.asfarray(data_in))
+    except:
+        err_mess = ( newline+' '                          + newline
+                    +'Problem: input data should be convertible to a numpy array.'
+                    +input_ins)
+        raise TypeError(err_mess)
 
     return np.ravel(data_out)
 
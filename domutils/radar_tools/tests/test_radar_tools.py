@@ -4,6 +4,10 @@
 #  python test_radar_tools.py Tests.test_read_odim_vol
 
 import unittest
+import matplotlib
+#figures are rendered off screen; selecting agg before the first pyplot
+#import avoids initializing an interactive gui backend
+matplotlib.use('Agg')
 
 class Tests(unittest.TestCase):
 